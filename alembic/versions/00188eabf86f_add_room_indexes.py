@@ -0,0 +1,30 @@
+"""add-room-indexes
+
+Revision ID: 00188eabf86f
+Revises: 777e588c50f3
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '00188eabf86f'
+down_revision = '777e588c50f3'
+
+
+def upgrade():
+    op.create_index(
+        'chatd_room_user__idx__uuid_tenant_uuid',
+        'chatd_room_user',
+        ['uuid', 'tenant_uuid'],
+    )
+    op.create_index(
+        'chatd_room_message__idx__room_uuid_created_at',
+        'chatd_room_message',
+        ['room_uuid', 'created_at'],
+    )
+
+
+def downgrade():
+    op.drop_index('chatd_room_message__idx__room_uuid_created_at')
+    op.drop_index('chatd_room_user__idx__uuid_tenant_uuid')
@@ -1,9 +1,17 @@
 # Copyright 2020 Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import os
 import pytest
+
+from contextlib import contextmanager
+from filelock import FileLock
+
 from .helpers import base as asset
 
+# Assets sharing this docker-compose project cannot be launched concurrently
+SHARED_PROJECT_GROUP = 'chatd'
+
 
 def pytest_collection_modifyitems(session, config, items):
     # item == test method
@@ -13,29 +21,59 @@ def pytest_collection_modifyitems(session, config, items):
     # It also remove the run-order pytest feature (--ff, --nf)
     items.sort(key=lambda item: item.parent.own_markers[0].args[0])
 
+    # With `pytest -n <workers> --dist loadgroup`, only database tests are
+    # spread over workers, each one having its own copy of the database
+    for item in items:
+        if item.parent.own_markers[0].args[0] != 'database':
+            item.add_marker(pytest.mark.xdist_group(name=SHARED_PROJECT_GROUP))
 
-@pytest.fixture(scope='session')
-def base():
-    asset.APIAssetLaunchingTestCase.setUpClass()
+
+@contextmanager
+def _launch_asset(asset_class, worker_id, tmp_path_factory):
+    if worker_id == 'master':
+        asset_class.setUpClass()
+        try:
+            yield
+        finally:
+            asset_class.tearDownClass()
+        return
+
+    # The first worker starts the containers and the last one removes them
+    root_dir = tmp_path_factory.getbasetemp().parent
+    counter = root_dir / f'{asset_class.asset}.workers'
+    lock = FileLock(f'{counter}.lock')
+
+    with lock:
+        workers = int(counter.read_text()) if counter.is_file() else 0
+        if not workers:
+            asset_class.setUpClass()
+        counter.write_text(str(workers + 1))
     try:
         yield
     finally:
-        asset.APIAssetLaunchingTestCase.tearDownClass()
+        with lock:
+            workers = int(counter.read_text()) - 1
+            counter.write_text(str(workers))
+            if not workers:
+                asset_class.tearDownClass()
 
 
 @pytest.fixture(scope='session')
-def initialization():
-    asset.InitAssetLaunchingTestCase.setUpClass()
-    try:
+def base(worker_id, tmp_path_factory):
+    with _launch_asset(asset.APIAssetLaunchingTestCase, worker_id, tmp_path_factory):
         yield
-    finally:
-        asset.InitAssetLaunchingTestCase.tearDownClass()
 
 
 @pytest.fixture(scope='session')
-def database():
-    asset.DBAssetLaunchingTestCase.setUpClass()
-    try:
+def initialization(worker_id, tmp_path_factory):
+    with _launch_asset(asset.InitAssetLaunchingTestCase, worker_id, tmp_path_factory):
+        yield
+
+
+@pytest.fixture(scope='session')
+def database(worker_id, tmp_path_factory):
+    with _launch_asset(asset.DBAssetLaunchingTestCase, worker_id, tmp_path_factory):
+        db_name = f'chatd_test_{worker_id}'
+        db_uri = asset.DBAssetLaunchingTestCase.create_test_database(db_name)
+        os.environ[asset.DB_TEST_URI_ENV] = db_uri
         yield
-    finally:
-        asset.DBAssetLaunchingTestCase.tearDownClass()
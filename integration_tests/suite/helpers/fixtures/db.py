@@ -5,9 +5,12 @@ import datetime
 import string
 import random
 import uuid
+import weakref
 
 from functools import wraps
 
+from sqlalchemy import insert
+
 from wazo_chatd.database.models import (
     Channel,
     Endpoint,
@@ -21,7 +24,12 @@ from wazo_chatd.database.models import (
     User,
 )
 
-from ..base import TOKEN_TENANT_UUID, WAZO_UUID
+from ..base import TOKEN_TENANT_UUID, WAZO_UUID, DBIntegrationTest
+
+# Wrappers created by the fixtures below. functools.wraps copies attributes of
+# the wrapped function, so a flag set on them would leak through other
+# decorators (e.g. fixtures.http or mock.patch)
+_DB_FIXTURES = weakref.WeakSet()
 
 
 def user(**user_args):
@@ -31,22 +39,23 @@ def user(**user_args):
             user_args.setdefault('uuid', uuid.uuid4())
             user_args.setdefault('tenant_uuid', TOKEN_TENANT_UUID)
             user_args.setdefault('state', 'unavailable')
-            model = User(**user_args)
+            user = User(**user_args)
 
-            user = self._dao.user.create(model)
-
-            self._session.commit()
+            self._session.add(user)
+            _flush_pending(self, decorated)
             args = list(args) + [user]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(User).filter(
-                    User.uuid == user_args['uuid']
-                ).delete()
-                self._session.commit()
+                if _needs_cleanup(self):
+                    self._session.query(User).filter(
+                        User.uuid == user_args['uuid']
+                    ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -64,31 +73,31 @@ def session(**session_args):
                 model = User(
                     uuid=user_uuid, tenant_uuid=TOKEN_TENANT_UUID, state='available'
                 )
-                self._dao.user.create(model)
+                self._session.add(model)
                 session_args['user_uuid'] = user_uuid
                 user_autogenerated = True
 
             session = Session(**session_args)
 
             self._session.add(session)
-            self._session.flush()
-
-            self._session.commit()
+            _flush_pending(self, decorated)
             args = list(args) + [session]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Session).filter(
-                    Session.uuid == session_args['uuid']
-                ).delete()
-                if user_autogenerated:
-                    self._session.query(User).filter(
-                        User.uuid == session_args['user_uuid']
+                if _needs_cleanup(self):
+                    self._session.query(Session).filter(
+                        Session.uuid == session_args['uuid']
                     ).delete()
-                self._session.commit()
+                    if user_autogenerated:
+                        self._session.query(User).filter(
+                            User.uuid == session_args['user_uuid']
+                        ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -106,31 +115,31 @@ def refresh_token(**refresh_token_args):
                 model = User(
                     uuid=user_uuid, tenant_uuid=TOKEN_TENANT_UUID, state='available'
                 )
-                self._dao.user.create(model)
+                self._session.add(model)
                 refresh_token_args['user_uuid'] = user_uuid
                 user_autogenerated = True
 
             refresh_token = RefreshToken(**refresh_token_args)
 
             self._session.add(refresh_token)
-            self._session.flush()
-
-            self._session.commit()
+            _flush_pending(self, decorated)
             args = list(args) + [refresh_token]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(RefreshToken).filter(
-                    RefreshToken.client_id == refresh_token_args['client_id']
-                ).delete()
-                if user_autogenerated:
-                    self._session.query(User).filter(
-                        User.uuid == refresh_token_args['user_uuid']
+                if _needs_cleanup(self):
+                    self._session.query(RefreshToken).filter(
+                        RefreshToken.client_id == refresh_token_args['client_id']
                     ).delete()
-                self._session.commit()
+                    if user_autogenerated:
+                        self._session.query(User).filter(
+                            User.uuid == refresh_token_args['user_uuid']
+                        ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -141,22 +150,23 @@ def tenant(**tenant_args):
         @wraps(decorated)
         def wrapper(self, *args, **kwargs):
             tenant_args.setdefault('uuid', uuid.uuid4())
-            model = Tenant(**tenant_args)
+            tenant = Tenant(**tenant_args)
 
-            tenant = self._dao.tenant.create(model)
-
-            self._session.commit()
+            self._session.add(tenant)
+            _flush_pending(self, decorated)
             args = list(args) + [tenant]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Tenant).filter(
-                    Tenant.uuid == tenant_args['uuid']
-                ).delete()
-                self._session.commit()
+                if _needs_cleanup(self):
+                    self._session.query(Tenant).filter(
+                        Tenant.uuid == tenant_args['uuid']
+                    ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -174,29 +184,31 @@ def line(**line_args):
                 model = User(
                     uuid=user_uuid, tenant_uuid=TOKEN_TENANT_UUID, state='available'
                 )
-                self._dao.user.create(model)
+                self._session.add(model)
                 line_args['user_uuid'] = user_uuid
                 user_autogenerated = True
 
             line = Line(**line_args)
 
             self._session.add(line)
-            self._session.flush()
-
-            self._session.commit()
+            _flush_pending(self, decorated)
             args = list(args) + [line]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Line).filter(Line.id == line_args['id']).delete()
-                if user_autogenerated:
-                    self._session.query(User).filter(
-                        User.uuid == line_args['user_uuid']
+                if _needs_cleanup(self):
+                    self._session.query(Line).filter(
+                        Line.id == line_args['id']
                     ).delete()
-                self._session.commit()
+                    if user_autogenerated:
+                        self._session.query(User).filter(
+                            User.uuid == line_args['user_uuid']
+                        ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -224,29 +236,39 @@ def room(**room_args):
                 message_args.setdefault('wazo_uuid', WAZO_UUID)
                 message_args.setdefault('created_at', created_at)
 
-            room_args['users'] = [
-                RoomUser(**user_args) for user_args in room_args['users']
-            ]
-            room_args['messages'] = [
-                RoomMessage(**msg_args) for msg_args in room_args['messages']
-            ]
-            room = Room(**room_args)
-
-            self._session.add(room)
-            self._session.flush()
-
-            self._session.commit()
+            room_values = {
+                key: value
+                for key, value in room_args.items()
+                if key not in ('users', 'messages')
+            }
+            self._session.flush()  # pending objects of the outer fixtures (tenant)
+            (room_uuid,) = _insert(self._session, Room, [room_values])
+            _insert(
+                self._session,
+                RoomUser,
+                [dict(user, room_uuid=room_uuid) for user in room_args['users']],
+            )
+            _insert(
+                self._session,
+                RoomMessage,
+                [dict(msg, room_uuid=room_uuid) for msg in room_args['messages']],
+            )
+
+            _flush_pending(self, decorated)
+            room = self._session.query(Room).get(room_uuid)
             args = list(args) + [room]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Room).filter(
-                    Room.uuid == room_args['uuid']
-                ).delete()
-                self._session.commit()
+                if _needs_cleanup(self):
+                    self._session.query(Room).filter(
+                        Room.uuid == room_args['uuid']
+                    ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -262,20 +284,20 @@ def endpoint(**endpoint_args):
             endpoint = Endpoint(**endpoint_args)
 
             self._session.add(endpoint)
-            self._session.flush()
-
-            self._session.commit()
+            _flush_pending(self, decorated)
             args = list(args) + [endpoint]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Endpoint).filter(
-                    Endpoint.name == endpoint_args['name']
-                ).delete()
-                self._session.commit()
+                if _needs_cleanup(self):
+                    self._session.query(Endpoint).filter(
+                        Endpoint.name == endpoint_args['name']
+                    ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
@@ -295,11 +317,10 @@ def channel(**channel_args):
                 user = User(
                     uuid=user_uuid, tenant_uuid=TOKEN_TENANT_UUID, state='available'
                 )
-                self._dao.user.create(user)
-
                 line_id = random.randint(1, 1000000)
                 line = Line(id=line_id)
-                self._dao.user.add_line(user, line)
+                user.lines.append(line)
+                self._session.add(user)
                 channel_args['line_id'] = line_id
 
                 user_autogenerated = True
@@ -307,27 +328,58 @@ def channel(**channel_args):
             channel = Channel(**channel_args)
 
             self._session.add(channel)
-            self._session.flush()
-
-            self._session.commit()
+            _flush_pending(self, decorated)
             args = list(args) + [channel]
             try:
                 result = decorated(self, *args, **kwargs)
             finally:
                 self._session.expunge_all()
-                self._session.query(Channel).filter(
-                    Channel.name == channel_args['name']
-                ).delete()
-                if user_autogenerated:
-                    self._session.query(User).filter(User.uuid == user_uuid).delete()
-                self._session.commit()
+                if _needs_cleanup(self):
+                    self._session.query(Channel).filter(
+                        Channel.name == channel_args['name']
+                    ).delete()
+                    if user_autogenerated:
+                        self._session.query(User).filter(
+                            User.uuid == user_uuid
+                        ).delete()
+                    self._session.commit()
             return result
 
+        _DB_FIXTURES.add(wrapper)
         return wrapper
 
     return decorator
 
 
+def _flush_pending(self, decorated):
+    # Only the fixture closest to the test flushes and commits, so that stacked
+    # fixtures send all their pending objects in a single flush
+    if decorated not in _DB_FIXTURES:
+        self._session.flush()
+        self._session.commit()
+
+
+def _needs_cleanup(self):
+    # DBIntegrationTest rolls back everything done by the test on tearDown
+    return not isinstance(self, DBIntegrationTest)
+
+
+def _insert(session, model, rows):
+    # Insert rows with multi-row VALUES instead of one INSERT per object. Every
+    # row of a VALUES clause needs the same columns, so rows are grouped by
+    # their columns and omitted columns keep their default
+    groups = {}
+    for row in rows:
+        groups.setdefault(frozenset(row), []).append(row)
+
+    table = model.__table__
+    uuids = []
+    for group in groups.values():
+        query = insert(table).values(group).returning(table.c.uuid)
+        uuids.extend(uuid_ for uuid_, in session.execute(query))
+    return uuids
+
+
 def _random_string(length=10):
     return ''.join(random.choice(string.ascii_letters) for _ in range(length))
 
@@ -1,7 +1,13 @@
 # Copyright 2019-2021 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from hamcrest import assert_that, calling, equal_to, has_properties
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_inanyorder,
+    equal_to,
+    has_properties,
+)
 from sqlalchemy.inspection import inspect
 
 from wazo_chatd.database.models import Endpoint
@@ -60,6 +66,17 @@ class TestEndpoint(DBIntegrationTest):
         result = self._dao.endpoint.find_by(name=UNKNOWN_NAME)
         assert_that(result, equal_to(None))
 
+    @fixtures.db.endpoint()
+    def test_find_by_unknown_key(self, _):
+        assert_that(
+            calling(self._dao.endpoint.find_by).with_args(nmae=UNKNOWN_NAME),
+            raises(TypeError),
+        )
+        assert_that(
+            calling(self._dao.endpoint.get_by).with_args(foo=1),
+            raises(TypeError),
+        )
+
     @fixtures.db.endpoint(state='available')
     def test_update(self, endpoint):
         state = 'unavailable'
@@ -78,3 +95,20 @@ class TestEndpoint(DBIntegrationTest):
 
         assert_that(inspect(endpoint_1).deleted)
         assert_that(inspect(endpoint_2).deleted)
+
+    @fixtures.db.endpoint(name='PJSIP/updated', state='unavailable')
+    @fixtures.db.endpoint(name='PJSIP/expired')
+    def test_sync(self, *_):
+        states = {'PJSIP/updated': 'available', 'PJSIP/created': 'available'}
+        self._dao.endpoint.sync(states)
+
+        result = self._session.query(Endpoint).all()
+        assert_that(
+            result,
+            contains_inanyorder(
+                has_properties(name='PJSIP/updated', state='available'),
+                has_properties(name='PJSIP/created', state='available'),
+            ),
+        )
+
+        self._dao.endpoint.delete_all()
@@ -82,6 +82,19 @@ class TestRoom(DBIntegrationTest):
         result = self._dao.room.list_([room_1.tenant_uuid], user_uuid=USER_UUID_1)
         assert_that(result, contains_inanyorder(room_1, room_2))
 
+    @fixtures.db.room(users=[{'uuid': USER_UUID_1}, {'uuid': USER_UUID_2}])
+    @fixtures.db.room(users=[{'uuid': USER_UUID_1}, {'uuid': USER_UUID_3}])
+    def test_list_loads_users(self, room_1, room_2):
+        with self.assert_max_queries(2):
+            result = self._dao.room.list_([TENANT_1])
+            assert_that(
+                result,
+                contains_inanyorder(
+                    has_properties(users=contains_inanyorder(*room_1.users)),
+                    has_properties(users=contains_inanyorder(*room_2.users)),
+                ),
+            )
+
     @fixtures.db.room(tenant_uuid=TENANT_1)
     @fixtures.db.room(tenant_uuid=TENANT_2)
     def test_count(self, room_1, room_2):
@@ -102,7 +115,7 @@ class TestRoom(DBIntegrationTest):
         room = Room(tenant_uuid=TENANT_1)
         room = self._dao.room.create(room)
 
-        self._session.expire_all()
+        self._session.expire(room)
         assert_that(room, has_properties(uuid=instance_of(uuid.UUID)))
 
     def test_create_with_users(self):
@@ -110,14 +123,13 @@ class TestRoom(DBIntegrationTest):
         room = Room(tenant_uuid=TENANT_1, users=[room_user])
         room = self._dao.room.create(room)
 
-        self._session.expire_all()
+        self._session.expire(room)
         assert_that(room, has_properties(uuid=instance_of(uuid.UUID)))
 
     @fixtures.db.room(users=[{'uuid': USER_UUID_1}])
     def test_delete_cascade(self, room):
         self._session.query(Room).filter(Room.uuid == room.uuid).delete()
 
-        self._session.expire_all()
         assert_that(inspect(room).deleted)
 
         result = (
@@ -131,7 +143,7 @@ class TestRoom(DBIntegrationTest):
 
         self._dao.room.add_message(room, message)
 
-        self._session.expire_all()
+        self._session.expire(room, ['messages'])
         assert_that(inspect(message).persistent)
         assert_that(room.messages, contains(message))
 
@@ -441,7 +453,7 @@ class TestRoomRelationships(DBIntegrationTest):
         room.users = [room_user]
         self._session.flush()
 
-        self._session.expire_all()
+        self._session.expire(room, ['users'])
         assert_that(inspect(room_user).persistent)
         assert_that(room.users, contains(room_user))
 
@@ -451,7 +463,7 @@ class TestRoomRelationships(DBIntegrationTest):
         room.users = []
         self._session.flush()
 
-        self._session.expire_all()
+        self._session.expire(room, ['users'])
         assert_that(inspect(room_user).deleted)
         assert_that(room.users, empty())
 
@@ -463,7 +475,7 @@ class TestRoomRelationships(DBIntegrationTest):
         self._session.add(room_user)
         self._session.flush()
 
-        self._session.expire_all()
+        self._session.expire(room, ['users'])
         assert_that(room.users, contains(room_user))
 
     @fixtures.db.room()
@@ -472,7 +484,7 @@ class TestRoomRelationships(DBIntegrationTest):
         room.messages = [message]
         self._session.flush()
 
-        self._session.expire_all()
+        self._session.expire(room, ['messages'])
         assert_that(inspect(message).persistent)
         assert_that(room.messages, contains(message))
 
@@ -485,7 +497,7 @@ class TestRoomRelationships(DBIntegrationTest):
         room.messages = []
         self._session.flush()
 
-        self._session.expire_all()
+        self._session.expire(room, ['messages'])
         assert_that(inspect(message).deleted)
         assert_that(room.messages, empty())
 
@@ -496,7 +508,7 @@ class TestRoomRelationships(DBIntegrationTest):
         message_1 = self.add_room_message(room_uuid=room.uuid, created_at=yesterday)
         message_2 = self.add_room_message(room_uuid=room.uuid, created_at=now)
 
-        self._session.expire_all()
+        self._session.expire(room, ['messages'])
         assert_that(room.messages, contains(message_2, message_1))
 
     def add_room_message(self, **kwargs):
@@ -515,5 +527,5 @@ class TestRoomMessageRelationships(DBIntegrationTest):
     def test_room_get(self, room):
         message = room.messages[0]
 
-        self._session.expire_all()
+        self._session.expire(message, ['room'])
         assert_that(message.room, equal_to(room))
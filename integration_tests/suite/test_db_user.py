@@ -119,6 +119,27 @@ class TestUser(DBIntegrationTest):
         result = self._dao.user.list_(tenant_uuids=None, uuids=[UNKNOWN_UUID])
         assert_that(result, empty())
 
+    @fixtures.db.session()
+    @fixtures.db.session()
+    def test_list_loads_collections(self, session_1, session_2):
+        with self.assert_max_queries(4):
+            result = self._dao.user.list_(tenant_uuids=None)
+            assert_that(
+                result,
+                has_items(
+                    has_properties(
+                        sessions=contains(session_1),
+                        refresh_tokens=empty(),
+                        lines=empty(),
+                    ),
+                    has_properties(
+                        sessions=contains(session_2),
+                        refresh_tokens=empty(),
+                        lines=empty(),
+                    ),
+                ),
+            )
+
     @fixtures.db.user(tenant_uuid=TENANT_1)
     @fixtures.db.user(tenant_uuid=TENANT_2)
     def test_count(self, user_1, user_2):
@@ -154,6 +175,44 @@ class TestUser(DBIntegrationTest):
             ),
         )
 
+    @fixtures.db.user(uuid=USER_UUID)
+    @fixtures.db.session(user_uuid=USER_UUID)
+    @fixtures.db.line(user_uuid=USER_UUID)
+    def test_delete_cascade(self, *_):
+        user = self._dao.user.get([TENANT_1], USER_UUID)
+
+        # Sessions and lines are deleted by the database, not by the ORM
+        with self.assert_max_queries(1):
+            self._dao.user.delete(user)
+
+        assert_that(inspect(user).deleted)
+
+        result = self._session.query(Session).filter(Session.user_uuid == USER_UUID)
+        assert_that(result.first(), none())
+
+        result = self._session.query(Line).filter(Line.user_uuid == USER_UUID)
+        assert_that(result.first(), none())
+
+    @fixtures.db.user(uuid=USER_UUID)
+    @fixtures.db.session(user_uuid=USER_UUID)
+    @fixtures.db.line(user_uuid=USER_UUID)
+    def test_delete_cascade_with_loaded_collections(self, *_):
+        user = self._dao.user.get([TENANT_1], USER_UUID)
+        assert_that(user.sessions, is_not(empty()))
+        assert_that(user.lines, is_not(empty()))
+
+        # Loaded children are deleted by the ORM: one DELETE per table, no SELECT
+        with self.assert_max_queries(3):
+            self._dao.user.delete(user)
+
+        assert_that(inspect(user).deleted)
+
+        result = self._session.query(Session).filter(Session.user_uuid == USER_UUID)
+        assert_that(result.first(), none())
+
+        result = self._session.query(Line).filter(Line.user_uuid == USER_UUID)
+        assert_that(result.first(), none())
+
     @fixtures.db.user()
     def test_add_session(self, user):
         session_uuid = uuid.uuid4()
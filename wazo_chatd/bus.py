@@ -102,12 +102,10 @@ class Consumer(ConsumerMixin):
 
     def _on_bus_message(self, body, message):
         try:
-            event = body['data']
-            event_name = body['name']
-        except KeyError:
-            logger.error('Invalid event message received: %s', event)
-        else:
-            self._events_pubsub.publish(event_name, event)
+            if 'data' not in body or 'name' not in body:
+                logger.error('Invalid event message received: %s', body)
+                return
+            self._events_pubsub.publish(body['name'], body['data'])
         finally:
             message.ack()
 
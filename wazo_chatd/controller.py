@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 
 class Controller:
     def __init__(self, config):
-        init_db(config['db_uri'])
+        self._config = config
         self._service_discovery_args = [
             'wazo-chatd',
             config['uuid'],
@@ -32,10 +32,24 @@ class Controller:
             lambda: True,
         ]
         self.status_aggregator = StatusAggregator()
+        self.thread_manager = ThreadManager()
+        self.rest_api = None
+        self.bus_consumer = None
+        self.bus_publisher = None
+        self.token_renewer = None
+
+    def _build(self):
+        # Clients and plugins are only created when the service starts
+        config = self._config
+        init_db(
+            config['db_uri'],
+            pool_size=config['db']['pool_size'],
+            max_overflow=config['db']['max_overflow'],
+            pool_recycle=config['db']['pool_recycle'],
+        )
         self.rest_api = CoreRestApi(config)
         self.bus_consumer = bus.Consumer(config)
         self.bus_publisher = bus.Publisher(config)
-        self.thread_manager = ThreadManager()
         auth_client = AuthClient(**config['auth'])
         self.token_renewer = TokenRenewer(auth_client)
         if not app.config['auth'].get('master_tenant_uuid'):
@@ -47,17 +61,20 @@ class Controller:
             names=config['enabled_plugins'],
             dependencies={
                 'api': api,
+                'auth_client': auth_client,
                 'config': config,
                 'dao': DAO(),
                 'bus_consumer': self.bus_consumer,
                 'bus_publisher': self.bus_publisher,
                 'status_aggregator': self.status_aggregator,
                 'thread_manager': self.thread_manager,
+                'token_renewer': self.token_renewer,
             },
         )
 
     def run(self):
         logger.info('wazo-chatd starting...')
+        self._build()
         self.status_aggregator.add_provider(self.bus_consumer.provide_status)
         self.status_aggregator.add_provider(auth.provide_status)
         signal.signal(signal.SIGTERM, partial(_sigterm_handler, self))
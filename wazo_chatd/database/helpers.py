@@ -4,13 +4,27 @@
 from contextlib import contextmanager
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext import baked
 from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 
 Session = scoped_session(sessionmaker())
 
+# Cache of the compiled SQL of hot path queries
+bakery = baked.bakery()
 
-def init_db(db_uri, echo=False):
-    engine = create_engine(db_uri, echo=echo, pool_pre_ping=True)
+
+def init_db(db_uri, echo=False, pool_size=10, max_overflow=20, pool_recycle=1800):
+    engine = create_engine(
+        db_uri,
+        echo=echo,
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_pre_ping=True,
+        use_batch_mode=True,  # psycopg2 execute_batch() for executemany
+    )
     Session.configure(bind=engine)
 
 
@@ -9,6 +9,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -52,12 +53,12 @@ class User(Base):
 
     tenant = relationship('Tenant')
     sessions = relationship(
-        'Session', cascade='all,delete-orphan', passive_deletes=False
+        'Session', cascade='all,delete-orphan', passive_deletes=True
     )
     refresh_tokens = relationship(
-        'RefreshToken', cascade='all,delete-orphan', passive_deletes=False
+        'RefreshToken', cascade='all,delete-orphan', passive_deletes=True
     )
-    lines = relationship('Line', cascade='all,delete-orphan', passive_deletes=False)
+    lines = relationship('Line', cascade='all,delete-orphan', passive_deletes=True)
 
 
 @generic_repr
@@ -111,7 +112,7 @@ class Line(Base):
     endpoint_state = association_proxy('endpoint', 'state')
 
     channels = relationship(
-        'Channel', cascade='all,delete-orphan', passive_deletes=False
+        'Channel', cascade='all,delete-orphan', passive_deletes=True
     )
     channels_state = association_proxy('channels', 'state')
 
@@ -167,11 +168,11 @@ class Room(Base):
         nullable=False,
     )
 
-    users = relationship('RoomUser', cascade='all,delete-orphan', passive_deletes=False)
+    users = relationship('RoomUser', cascade='all,delete-orphan', passive_deletes=True)
     messages = relationship(
         'RoomMessage',
         cascade='all,delete-orphan',
-        passive_deletes=False,
+        passive_deletes=True,
         order_by='desc(RoomMessage.created_at)',
     )
 
@@ -180,6 +181,9 @@ class Room(Base):
 class RoomUser(Base):
 
     __tablename__ = 'chatd_room_user'
+    __table_args__ = (
+        Index('chatd_room_user__idx__uuid_tenant_uuid', 'uuid', 'tenant_uuid'),
+    )
 
     room_uuid = Column(
         UUIDType(),
@@ -195,6 +199,11 @@ class RoomUser(Base):
 class RoomMessage(Base):
 
     __tablename__ = 'chatd_room_message'
+    __table_args__ = (
+        Index(
+            'chatd_room_message__idx__room_uuid_created_at', 'room_uuid', 'created_at'
+        ),
+    )
 
     uuid = Column(
         UUIDType(), server_default=text('uuid_generate_v4()'), primary_key=True
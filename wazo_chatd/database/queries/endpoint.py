@@ -1,11 +1,13 @@
 # Copyright 2019-2020 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from sqlalchemy import and_, text
+from sqlalchemy.dialects.postgresql import insert
 
 from ...exceptions import UnknownEndpointException
 from ..models import Endpoint
 
+FIND_BY_KEYS = {'name', 'state'}
+
 
 class EndpointDAO:
     def __init__(self, session):
@@ -36,17 +38,44 @@ class EndpointDAO:
         return endpoint
 
     def _find_by(self, **kwargs):
-        filter_ = text('true')
+        unknown = kwargs.keys() - FIND_BY_KEYS
+        if unknown:
+            raise TypeError(
+                'Endpoint cannot be filtered by {}'.format(', '.join(sorted(unknown)))
+            )
 
-        if 'name' in kwargs:
-            filter_ = and_(filter_, Endpoint.name == kwargs['name'])
+        if kwargs.keys() == {'name'}:
+            if kwargs['name'] is None:
+                return None
+            # Primary key lookup: checks the identity map before the database
+            return self.session.query(Endpoint).get(kwargs['name'])
 
-        return self.session.query(Endpoint).filter(filter_).first()
+        return self.session.query(Endpoint).filter_by(**kwargs).first()
 
     def update(self, endpoint):
         self.session.add(endpoint)
         self.session.flush()
 
+    def sync(self, states):
+        # states: {endpoint name: endpoint state} of every existing endpoint
+        if not states:
+            self.delete_all()
+            return
+
+        self.session.query(Endpoint).filter(Endpoint.name.notin_(list(states))).delete(
+            synchronize_session=False
+        )
+        rows = [{'name': name, 'state': state} for name, state in states.items()]
+        query = insert(Endpoint.__table__).values(rows)
+        query = query.on_conflict_do_update(
+            index_elements=['name'], set_={'state': query.excluded.state}
+        )
+        self.session.execute(query)
+
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, Endpoint):
+                self.session.expire(obj)
+
     def delete_all(self):
         self.session.query(Endpoint).delete()
         self.session.flush()
@@ -2,9 +2,11 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from sqlalchemy.sql.functions import ReturnTypeFromArgs
-from sqlalchemy import text
+from sqlalchemy import and_, bindparam, exists, func, text
+from sqlalchemy.orm import selectinload
 
 from ...exceptions import UnknownRoomException
+from ..helpers import bakery
 from ..models import Room, RoomUser, RoomMessage
 
 
@@ -26,25 +28,39 @@ class RoomDAO:
         return room
 
     def get(self, tenant_uuids, room_uuid):
-        query = self.session.query(Room).filter(
-            Room.tenant_uuid.in_(tenant_uuids), Room.uuid == room_uuid
-        )
-        room = query.first()
+        room = None
+        if tenant_uuids:
+            query = bakery(lambda session: session.query(Room))
+            query += lambda q: q.filter(
+                Room.tenant_uuid.in_(bindparam('tenant_uuids', expanding=True)),
+                Room.uuid == bindparam('room_uuid'),
+            )
+            room = (
+                query(self.session)
+                .params(tenant_uuids=list(tenant_uuids), room_uuid=room_uuid)
+                .first()
+            )
         if not room:
             raise UnknownRoomException(room_uuid)
         return room
 
     def list_(self, tenant_uuids, **filter_parameters):
-        return self._list_query(tenant_uuids, **filter_parameters).all()
+        query = self._list_query(tenant_uuids, **filter_parameters)
+        return query.options(selectinload(Room.users)).all()
 
     def count(self, tenant_uuids, **filter_parameters):
-        return self._list_query(tenant_uuids, **filter_parameters).count()
+        query = self._list_query(tenant_uuids, **filter_parameters)
+        return query.with_entities(func.count(Room.uuid)).scalar()
 
     def _list_query(self, tenant_uuids=None, user_uuid=None):
         query = self.session.query(Room)
 
         if user_uuid:
-            query = query.join(RoomUser).filter(RoomUser.uuid == user_uuid)
+            query = query.filter(
+                exists().where(
+                    and_(RoomUser.room_uuid == Room.uuid, RoomUser.uuid == user_uuid)
+                )
+            )
 
         if tenant_uuids is None:
             return query
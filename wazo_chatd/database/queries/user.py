@@ -1,10 +1,12 @@
 # Copyright 2019-2020 The Wazo Authors  (see the AUTHORS file)
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import selectinload
 
 from ...exceptions import UnknownUserException
-from ..models import User
+from ..helpers import bakery
+from ..models import Line, User
 
 
 class UserDAO:
@@ -25,11 +27,18 @@ class UserDAO:
         self.session.flush()
 
     def get(self, tenant_uuids, user_uuid):
-        query = self.session.query(User).filter(
-            User.tenant_uuid.in_(tenant_uuids), User.uuid == user_uuid
-        )
-
-        user = query.first()
+        user = None
+        if tenant_uuids:
+            query = bakery(lambda session: session.query(User))
+            query += lambda q: q.filter(
+                User.tenant_uuid.in_(bindparam('tenant_uuids', expanding=True)),
+                User.uuid == bindparam('user_uuid'),
+            )
+            user = (
+                query(self.session)
+                .params(tenant_uuids=list(tenant_uuids), user_uuid=user_uuid)
+                .first()
+            )
         if not user:
             raise UnknownUserException(user_uuid)
         return user
@@ -40,6 +49,12 @@ class UserDAO:
             uuids=uuids,
             **filter_parameters,
         )
+        # Load the collections needed by the presence serialization in bulk
+        query = query.options(
+            selectinload(User.sessions),
+            selectinload(User.refresh_tokens),
+            selectinload(User.lines).selectinload(Line.channels),
+        )
         return query.all()
 
     def count(self, tenant_uuids, **filter_parameters):
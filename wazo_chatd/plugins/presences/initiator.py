@@ -375,23 +375,19 @@ class Initiator:
                     self._dao.refresh_token.update(cached_token)
 
     def initiate_endpoints(self, events):
-        with session_scope():
-            logger.debug('Delete all endpoints')
-            self._dao.endpoint.delete_all()
-            for event in events:
-                if event.get('Event') != 'DeviceStateChange':
-                    continue
+        states = {}
+        for event in events:
+            if event.get('Event') != 'DeviceStateChange':
+                continue
 
-                endpoint_args = {
-                    'name': event['Device'],
-                    'state': DEVICE_STATE_MAP.get(event['State'], 'unavailable'),
-                }
-                logger.debug(
-                    'Create endpoint "%s" with state "%s"',
-                    endpoint_args['name'],
-                    endpoint_args['state'],
-                )
-                self._dao.endpoint.create(Endpoint(**endpoint_args))
+            name = event['Device']
+            state = DEVICE_STATE_MAP.get(event['State'], 'unavailable')
+            logger.debug('Sync endpoint "%s" with state "%s"', name, state)
+            states[name] = state
+
+        with session_scope():
+            logger.debug('Sync all endpoints')
+            self._dao.endpoint.sync(states)
 
     def initiate_channels(self, events):
         with session_scope():
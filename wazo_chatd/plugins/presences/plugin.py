@@ -4,7 +4,6 @@
 import logging
 
 from wazo_amid_client import Client as AmidClient
-from wazo_auth_client import Client as AuthClient
 from wazo_confd_client import Client as ConfdClient
 
 from .bus_consume import BusEventHandler
@@ -21,6 +20,7 @@ logger = logging.getLogger(__name__)
 class Plugin:
     def load(self, dependencies):
         api = dependencies['api']
+        auth = dependencies['auth_client']
         config = dependencies['config']
         dao = dependencies['dao']
         bus_consumer = dependencies['bus_consumer']
@@ -32,7 +32,6 @@ class Plugin:
         service = PresenceService(dao, notifier)
         initialization = config['initialization']
 
-        auth = AuthClient(**config['auth'])
         amid = AmidClient(**config['amid'])
         confd = ConfdClient(**config['confd'])
         initiator = Initiator(dao, auth, amid, confd)
@@ -0,0 +1,66 @@
+# Copyright 2022 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from unittest import TestCase
+from mock import Mock
+
+from ..bus import Consumer
+
+
+class TestConsumer(TestCase):
+    def setUp(self):
+        config = {
+            'bus': {
+                'username': 'user',
+                'password': 'secret',
+                'host': 'localhost',
+                'port': 5672,
+                'exchange_name': 'xivo',
+                'exchange_type': 'topic',
+            }
+        }
+        self.consumer = Consumer(config)
+        self.consumer._events_pubsub = Mock()
+        self.message = Mock()
+
+    def test_on_bus_message(self):
+        body = {'name': 'event_name', 'data': {'key': 'value'}}
+
+        self.consumer._on_bus_message(body, self.message)
+
+        self.consumer._events_pubsub.publish.assert_called_once_with(
+            'event_name', {'key': 'value'}
+        )
+        self.message.ack.assert_called_once_with()
+
+    def test_on_bus_message_with_null_data(self):
+        body = {'name': 'event_name', 'data': None}
+
+        self.consumer._on_bus_message(body, self.message)
+
+        self.consumer._events_pubsub.publish.assert_called_once_with('event_name', None)
+        self.message.ack.assert_called_once_with()
+
+    def test_on_bus_message_without_name(self):
+        body = {'data': {'key': 'value'}}
+
+        self.consumer._on_bus_message(body, self.message)
+
+        self.consumer._events_pubsub.publish.assert_not_called()
+        self.message.ack.assert_called_once_with()
+
+    def test_on_bus_message_without_data(self):
+        body = {'name': 'event_name'}
+
+        self.consumer._on_bus_message(body, self.message)
+
+        self.consumer._events_pubsub.publish.assert_not_called()
+        self.message.ack.assert_called_once_with()
+
+    def test_on_bus_message_when_callback_fails(self):
+        body = {'name': 'event_name', 'data': {'key': 'value'}}
+        self.consumer._events_pubsub.publish.side_effect = Exception
+
+        self.assertRaises(Exception, self.consumer._on_bus_message, body, self.message)
+
+        self.message.ack.assert_called_once_with()
@@ -2,9 +2,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 from unittest import TestCase
-from mock import Mock
+from mock import Mock, patch
 
-from ..controller import _sigterm_handler
+from ..controller import Controller, _sigterm_handler
 
 
 class Testclassname(TestCase):
@@ -16,3 +16,20 @@ class Testclassname(TestCase):
 
     def test_sigterm_handler(self):
         _sigterm_handler(Mock(), Mock(), Mock())
+
+    @patch('wazo_chatd.controller.plugin_helpers')
+    @patch('wazo_chatd.controller.CoreRestApi')
+    @patch('wazo_chatd.controller.init_db')
+    def test_init_does_not_build_clients(self, init_db, CoreRestApi, plugin_helpers):
+        config = {
+            'uuid': Mock(),
+            'consul': Mock(),
+            'service_discovery': Mock(),
+            'bus': Mock(),
+        }
+
+        Controller(config)
+
+        init_db.assert_not_called()
+        CoreRestApi.assert_not_called()
+        plugin_helpers.load.assert_not_called()